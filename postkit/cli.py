@@ -1,6 +1,5 @@
 import typer
 from rich.console import Console
-from rich.progress import Progress, SpinnerColumn, TextColumn
 from pathlib import Path
 
 app = typer.Typer(name="postkit", help="Multi-platform publishing")
@@ -24,13 +23,18 @@ def publish(
     from .utils.auth import load_credentials
     creds = load_credentials(Path("config.yaml"))
     
-    # Parse content
-    from .formats.markdown import parse_markdown_post
-    post_data = parse_markdown_post(content_path)
-    
-    # Normalize
-    from .formats.normalizer import normalize_for_platforms
-    normalized = normalize_for_platforms(post_data, image, video)
+    # Parse + normalize (cached on disk until the file changes)
+    from .utils.cache import get_or_compute
+
+    def parse_and_normalize():
+        from .formats.markdown import parse_markdown_post
+        from .formats.normalizer import normalize_for_platforms
+        post_data = parse_markdown_post(content_path)
+        return post_data, normalize_for_platforms(post_data, image, video)
+
+    # The cached HTML depends on which markdown renderer is installed
+    from .formats.markdown import renderer_id
+    post_data, normalized = get_or_compute(content_path, parse_and_normalize, image, video, renderer_id())
     
     # Dry run preview
     if dry_run:
@@ -45,6 +49,8 @@ def publish(
         return
     
     # Publish
+    import asyncio
+    from rich.progress import Progress, SpinnerColumn, TextColumn
     console.print("\n[bold cyan]🚀 Publishing...[/bold cyan]\n")
     
     results = {'success': [], 'failed': []}
@@ -55,45 +61,7 @@ def publish(
         console=console
     ) as progress:
         
-        # AT Protocol
-        if 'atproto' in creds:
-            task = progress.add_task("Publishing to AT Protocol...", total=None)
-            try:
-                from .platforms.atproto import ATProtoPublisher
-                pub = ATProtoPublisher(creds['atproto'])
-                at_results = pub.publish(normalized['atproto'])
-                
-                for platform, success in at_results.items():
-                    if success:
-                        results['success'].append(platform)
-                        console.print(f"[green]✓[/green] {platform}")
-                    else:
-                        results['failed'].append(platform)
-                        console.print(f"[red]✗[/red] {platform}")
-            except Exception as e:
-                console.print(f"[red]✗[/red] AT Protocol error: {e}")
-                results['failed'].extend(['Bluesky', 'Flashes', 'Pinksky'])
-            finally:
-                progress.update(task, completed=True)
-        
-        # Substack
-        if 'substack' in creds:
-            task = progress.add_task("Publishing to Substack...", total=None)
-            try:
-                from .platforms.substack import SubstackPublisher
-                pub = SubstackPublisher(creds['substack'])
-                success = pub.publish(normalized['substack'])
-                
-                if success:
-                    results['success'].append('Substack')
-                    console.print(f"[green]✓[/green] Substack")
-                else:
-                    results['failed'].append('Substack')
-            except Exception as e:
-                console.print(f"[red]✗[/red] Substack error: {e}")
-                results['failed'].append('Substack')
-            finally:
-                progress.update(task, completed=True)
+        asyncio.run(_publish_all(creds, normalized, progress, results))
     
     # Summary
     console.print(f"\n[bold]📊 Summary[/bold]")
@@ -103,6 +71,63 @@ def publish(
     if results['failed']:
         raise typer.Exit(1)
 
+async def _publish_all(creds, normalized, progress, results):
+    """Run every configured platform concurrently"""
+    import asyncio
+    tasks = []
+    if 'atproto' in creds:
+        tasks.append(_publish_atproto(creds['atproto'], normalized['atproto'], progress, results))
+    if 'substack' in creds:
+        tasks.append(_publish_substack(creds['substack'], normalized['substack'], progress, results))
+    
+    await asyncio.gather(*tasks)
+
+async def _publish_atproto(credentials, content, progress, results):
+    from .platforms import AT_PROTOCOL_APPS
+    task = progress.add_task("Publishing to AT Protocol...", total=None)
+    try:
+        from .platforms.atproto import ATProtoPublisher
+        pub = ATProtoPublisher(credentials)
+        at_results = await pub.publish(content)
+        
+        for platform, success in at_results.items():
+            if success:
+                results['success'].append(platform)
+                console.print(f"[green]✓[/green] {platform}")
+            else:
+                results['failed'].append(platform)
+                console.print(f"[red]✗[/red] {platform}")
+    except Exception as e:
+        console.print(f"[red]✗[/red] AT Protocol error: {e}")
+        results['failed'].extend(AT_PROTOCOL_APPS)
+    finally:
+        progress.update(task, completed=True)
+
+async def _publish_substack(credentials, content, progress, results):
+    import asyncio
+    task = progress.add_task("Publishing to Substack...", total=None)
+    try:
+        from .platforms.substack import SubstackPublisher
+        
+        def send_and_close():
+            # QUIT blocks on the server's reply too, so it runs off the loop
+            with SubstackPublisher(credentials) as pub:
+                return pub.publish(content)
+        
+        loop = asyncio.get_running_loop()
+        success = await loop.run_in_executor(None, send_and_close)
+        
+        if success:
+            results['success'].append('Substack')
+            console.print(f"[green]✓[/green] Substack")
+        else:
+            results['failed'].append('Substack')
+    except Exception as e:
+        console.print(f"[red]✗[/red] Substack error: {e}")
+        results['failed'].append('Substack')
+    finally:
+        progress.update(task, completed=True)
+
 @app.command()
 def init():
     """Initialize config file"""
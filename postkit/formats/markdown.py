@@ -1,8 +1,84 @@
-from importlib import metadata
+import functools
 from pathlib import Path
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional, Tuple, Union
 import re
-import yaml
+
+_H1_RE = re.compile(r'^#\s+(.+)$', re.MULTILINE)
+
+# Frontmatter fast path: flat 'key: value' lines whose values YAML would
+# read as plain strings. Anything else goes through the YAML parser
+_SIMPLE_KEY_RE = re.compile(r'[A-Za-z_][\w-]*\Z')
+_NON_STRING_START_RE = re.compile(r'''[-+.\d~=<?:,\[\]{}#&*!|>'"%@`]''')
+_YAML_KEYWORDS = frozenset(('null', 'true', 'false', 'yes', 'no', 'on', 'off', 'y', 'n'))
+
+# Header prefixes for the fallback renderer, longest first
+_HEADER_TAGS = (('### ', 'h3'), ('## ', 'h2'), ('# ', 'h1'))
+
+def _split_frontmatter(raw: bytes) -> Tuple[Optional[bytes], bytes]:
+    """
+    Split a leading '---' fenced frontmatter block from the body
+    Works on the undecoded file bytes so each part is decoded only once
+    Returns (frontmatter, body), or (None, raw) when there is none
+    """
+    if not raw.startswith(b'---'):
+        return None, raw
+    
+    # Opening fence must be alone on its line
+    open_end = raw.find(b'\n')
+    if open_end == -1 or raw[3:open_end].strip():
+        return None, raw
+    
+    # Closing fence: first '---' line after the opening one
+    end = raw.find(b'\n---', open_end)
+    while end != -1:
+        line_end = raw.find(b'\n', end + 4)
+        if line_end == -1:
+            line_end = len(raw)
+        if not raw[end + 4:line_end].strip():
+            return raw[open_end + 1:end], raw[line_end + 1:].lstrip(b'\n')
+        end = raw.find(b'\n---', end + 4)
+    
+    return None, raw
+
+def _parse_simple_frontmatter(text: str) -> Optional[Dict[str, str]]:
+    """
+    Parse frontmatter made only of 'key: plain string' lines without YAML
+    Returns None as soon as a line needs the real parser
+    """
+    metadata = {}
+    for line in text.split('\n'):
+        if not line.isprintable():
+            # Tabs, control characters and Unicode line breaks all have
+            # YAML-specific rules: leave them to the parser
+            return None
+        line = line.rstrip()
+        if not line or line.startswith('#'):
+            continue
+        
+        key, _, rest = line.partition(':')
+        value = rest.strip()
+        if (
+            not rest.startswith(' ')
+            or not value
+            or not _SIMPLE_KEY_RE.match(key)
+            or key.lower() in _YAML_KEYWORDS
+            or key in metadata
+            or _NON_STRING_START_RE.match(value)
+            or value.lower() in _YAML_KEYWORDS
+            or value.endswith(':')
+            or ': ' in value
+            or ' #' in value
+        ):
+            return None
+        metadata[key] = value
+    
+    return metadata
+
+def _load_yaml(text: Union[str, bytes]) -> Any:
+    """yaml.safe_load, using the libyaml C loader when PyYAML was built with it"""
+    import yaml
+    loader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+    return yaml.load(text, Loader=loader)
 
 def parse_markdown_post(file_path: Path) -> Dict[str, Any]:
     """
@@ -22,25 +98,32 @@ def parse_markdown_post(file_path: Path) -> Dict[str, Any]:
         'short': 'Brief summary',
         'tags': ['tech', 'python'],
         'content': '# Content here',
+        'blocks': ['# Content here'],
         'html': '<h1>Content here</h1>'
     }
     """
     
-    content = file_path.read_text(encoding='utf-8')
+    with open(file_path, 'rb') as f:
+        raw = f.read()
     
-    frontmatter_match = r'^---\s*\n(.*?)\n---\s*\n(.*)$'
-    match = re.match(frontmatter_match, content, re.DOTALL)
+    # Same newline handling read_text() gave us
+    if b'\r' in raw:
+        raw = raw.replace(b'\r\n', b'\n').replace(b'\r', b'\n')
     
-    if match:
-        frontmatter_text, body= match.groups()
-        metadata = yaml.safe_load(frontmatter_text) or {}
+    frontmatter, body = _split_frontmatter(raw)
+    
+    # Typical frontmatter is flat strings; full YAML only when it isn't
+    if frontmatter is not None:
+        metadata = _parse_simple_frontmatter(frontmatter.decode('utf-8'))
+        if metadata is None:
+            metadata = _load_yaml(frontmatter) or {}
     else:
         metadata = {}
-        body = content
+    body = body.decode('utf-8')
         
     title = metadata.get('title')
     if not title:
-        h1_match = re.search(r'^#\s+(.+)$', body, re.MULTILINE)
+        h1_match = _H1_RE.search(body)
         if h1_match:
             title = h1_match.group(1).strip()
         else:
@@ -57,48 +140,163 @@ def parse_markdown_post(file_path: Path) -> Dict[str, Any]:
         'short': metadata.get('short', ''),
         'tags': tags,
         'content': body.strip(),
+        'blocks': split_blocks(body),
         'html': html,
         'metadata': metadata
     }
     
+def split_blocks(text: str) -> List[str]:
+    """
+    Split markdown into its blank-line separated blocks (stripped, non-empty)
+    Done once per post; the normalizer builds summaries and threads from these
+    """
+    return [block.strip() for block in text.split('\n\n') if block.strip()]
+
 def markdown_to_html(markdown_text: str) -> str:
     """
     Convert markdown to HTML
+    Identical input within a run is only rendered once
     """
+    return _render_cached(markdown_text)
+
+@functools.lru_cache(maxsize=128)
+def _render_cached(markdown_text: str) -> str:
     try:
-        import markdown
-        md = markdown.Markdown(extensions=['extra'])
-        return md.convert(markdown_text)
-    except ImportError:
-        return basic_markdown_to_html(markdown_text)
+        return _get_renderer()(markdown_text)
     except Exception:
         return basic_markdown_to_html(markdown_text)
+
+_renderer = None
+
+# (import name, distribution name) in _get_renderer's order of preference
+_RENDERER_PACKAGES = (('mistune', 'mistune'), ('markdown', 'Markdown'))
+
+def renderer_id() -> str:
+    """
+    Name and version of the renderer _get_renderer would pick, read from
+    package metadata so the renderer itself isn't imported
+    """
+    import importlib.util
+    from importlib.metadata import version, PackageNotFoundError
+    
+    for module, dist in _RENDERER_PACKAGES:
+        if importlib.util.find_spec(module) is not None:
+            try:
+                return f"{module} {version(dist)}"
+            except PackageNotFoundError:
+                return module
+    return 'basic'
+
+def _get_renderer():
+    """
+    Build the renderer once per process
+    Prefers mistune, then python-markdown, then basic_markdown_to_html
+    """
+    global _renderer
+    if _renderer is None:
+        try:
+            import mistune
+            _renderer = mistune.create_markdown(
+                escape=False,
+                plugins=['strikethrough', 'table', 'url', 'footnotes', 'def_list', 'abbr']
+            )
+        except ImportError:
+            try:
+                import markdown
+                md = markdown.Markdown(extensions=['extra'])
+                _renderer = lambda text: md.reset().convert(text)
+            except ImportError:
+                _renderer = basic_markdown_to_html
+    return _renderer
     
 def basic_markdown_to_html(text: str) -> str:
     """
     Backup method
     Converts: headers, bold, italic, links
+    Single pass over the lines; blank lines separate paragraphs
     """
-    html = text
+    paragraphs = []
+    block = []
     
-    html = re.sub(r'^### (.+)$', r'<h3>\1</h3>', html, flags=re.MULTILINE)
-    html = re.sub(r'^## (.+)$', r'<h2>\1</h2>', html, flags=re.MULTILINE)
-    html = re.sub(r'^# (.+)$', r'<h1>\1</h1>', html, flags=re.MULTILINE)
+    for line in text.splitlines():
+        if not line:
+            if block:
+                paragraphs.append('\n'.join(block))
+                block = []
+            continue
+        
+        for prefix, tag in _HEADER_TAGS:
+            if line.startswith(prefix) and len(line) > len(prefix):
+                line = f'<{tag}>{_render_inline(line[len(prefix):])}</{tag}>'
+                break
+        else:
+            line = _render_inline(line)
+        block.append(line)
     
-    html = re.sub(r'\*\*(.+?)\*\*', r'<strong>\1</strong>', html)
+    if block:
+        paragraphs.append('\n'.join(block))
     
-    html = re.sub(r'\*(.+?)\*', r'<em>\1</em>', html)
+    # Blocks are never empty, so a whitespace check is enough to filter
+    html = '\n'.join([
+        p if p.startswith('<h') else f'<p>{p}</p>'
+        for p in paragraphs
+        if not p.isspace()
+    ])
     
-    html = re.sub(r'\[(.+?)\]\((.+?)\)', r'<a href="\2">\1</a>', html)
+    return html
+
+def _next_marker(text: str, start: int) -> int:
+    """Index of the next '*' or '[' at or after start, -1 if none"""
+    star = text.find('*', start)
+    bracket = text.find('[', start)
+    if star == -1:
+        return bracket
+    if bracket == -1:
+        return star
+    return min(star, bracket)
+
+def _render_inline(text: str) -> str:
+    """
+    Convert **bold**, *italic* and [text](url) within a single line
+    """
+    parts = []
+    pos = 0
+    i = _next_marker(text, 0)
     
-    paragraphs = html.split('\n\n')
-    html = '\n'.join(
-        f'<p>{p}</p>' if not p.startswith('<h') else p 
-        for p in paragraphs 
-        if p.strip()
-    )
+    while i != -1:
+        if text.startswith('**', i):
+            end = text.find('**', i + 2)
+            if end > i + 2:
+                parts.append(text[pos:i])
+                parts.append(f'<strong>{_render_inline(text[i + 2:end])}</strong>')
+                pos = end + 2
+                i = _next_marker(text, pos)
+                continue
+        elif text[i] == '*':
+            # Closing '*' must not be half of a '**' pair
+            end = text.find('*', i + 1)
+            while end != -1 and text.startswith('**', end):
+                end = text.find('*', end + 2)
+            if end > i + 1:
+                parts.append(text[pos:i])
+                parts.append(f'<em>{_render_inline(text[i + 1:end])}</em>')
+                pos = end + 1
+                i = _next_marker(text, pos)
+                continue
+        else:
+            middle = text.find('](', i + 1)
+            end = text.find(')', middle + 2) if middle > i + 1 else -1
+            if end > middle + 2:
+                parts.append(text[pos:i])
+                parts.append(f'<a href="{text[middle + 2:end]}">{_render_inline(text[i + 1:middle])}</a>')
+                pos = end + 1
+                i = _next_marker(text, pos)
+                continue
+        
+        i = _next_marker(text, i + 1)
     
-    return html
+    parts.append(text[pos:])
+    return ''.join(parts)
 
 def truncate_text(text: str, max_length: int, ellipsis: str = '...') -> str:
     """
@@ -1,7 +1,17 @@
+import functools
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 import re
 
+_HEADER_STRIP_RE = re.compile(r'^#+(?:[ \t].*)?$', re.MULTILINE)
+_H1_LINE_RE = re.compile(r'^#\s+.+$', re.MULTILINE)
+_H2_LINE_RE = re.compile(r'^##\s+(.+)$', re.MULTILINE)
+_H3_LINE_RE = re.compile(r'^###\s+(.+)$', re.MULTILINE)
+_SENTENCE_SPLIT_RE = re.compile(r'(?<=[.!?])\s+')
+
+# Hashtags can't contain whitespace
+_HASHTAG_TRANS = str.maketrans('', '', ' \t\r\n')
+
 def normalize_for_platforms(
     post_data: Dict[str, Any],
     image_path: Optional[Path] = None,
@@ -29,26 +39,26 @@ def normalize_for_platforms(
         }
     }
     """
-    content = post_data['content']
+    blocks = post_data['blocks']
     title = post_data['title']
     short = post_data.get('short', '')
     tags = post_data.get('tags', [])
     html = post_data['html']
     
-    thread_chunks = create_thread_chunks(content, title, max_length=300)
+    thread_chunks = create_thread_chunks(blocks, title, max_length=300)
     
     if short:
         summary = short
     else:
-        first_para = extract_first_paragraph(content)
+        first_para = extract_first_paragraph(blocks)
         summary = truncate_text(first_para, 280)
     
-    if title.lower() not in summary.lower():
+    if title.casefold() not in summary.casefold():
         summary = f"{title}\n\n{summary}"
         summary = truncate_text(summary, 280)
     
     # Format hashtags
-    hashtags = [f"#{tag.strip().replace(' ', '')}" for tag in tags]
+    hashtags = [f"#{tag}" for tag in (t.translate(_HASHTAG_TRANS) for t in tags) if tag]
         
     # Build HTML email for Substack
     email_html = build_substack_email(title, html, image_path)
@@ -71,26 +81,41 @@ def normalize_for_platforms(
     }
 
     
-def extract_first_paragraph(content: str) -> str:
+def extract_first_paragraph(blocks: List[str]) -> str:
     """
-    Get the first paragraph from markdown content
+    Get the first paragraph from the post's blocks
     Used for creating summaries
     """
-    # Remove any frontmatter
-    content = re.sub(r'^---\s*\n.*?\n---\s*\n', '', content, flags=re.DOTALL)
-    
-    # Remove headers (lines starting with #)
-    content = re.sub(r'^#+\s+.+$', '', content, flags=re.MULTILINE)
+    for block in blocks:
+        # Only blocks that contain a header line need the regex
+        if _has_header(block):
+            for part in _strip_headers(block).split('\n\n'):
+                if part.strip():
+                    return part.strip()
+        else:
+            return block
     
-    # Split by blank lines and get first non-empty paragraph
-    paragraphs = [p.strip() for p in content.split('\n\n') if p.strip()]
-    return paragraphs[0] if paragraphs else ''
+    return ''
+
+
+def _has_header(block: str) -> bool:
+    return block.startswith('#') or '\n#' in block
+
+
+def _strip_headers(text: str) -> str:
+    """Remove header lines (lines starting with #)"""
+    return _HEADER_STRIP_RE.sub('', text)
 
 
 def truncate_text(text: str, max_length: int, ellipsis: str = '...') -> str:
     """
     Cut text to max_length, adding ... at the end
     """
+    return _truncate_cached(text, max_length, ellipsis)
+
+
+@functools.lru_cache(maxsize=64)
+def _truncate_cached(text: str, max_length: int, ellipsis: str) -> str:
     if len(text) <= max_length:
         return text
     
@@ -101,28 +126,41 @@ def truncate_text(text: str, max_length: int, ellipsis: str = '...') -> str:
     return text[:cutoff] + ellipsis
 
 
-def create_thread_chunks(content, title, max_length=300):
+def create_thread_chunks(blocks, title, max_length=300):
     """
     Smart chunking strategy with reserved space for thread numbering
     
     Strategy:
-    1. Make initial chunks with conservative limit
-    2. Calculate suffix length based on total chunks
-    3. Re-chunk if needed to ensure all fit within max_length
+    1. Clean headers in the post's blocks once
+    2. Chunk with room for 1-digit numbering, "\n\n(9/9)"
+    3. Only if that yields 10+ chunks, re-chunk with room for 2 digits, etc.
     """
     
+    paragraphs = []
+    for block in blocks:
+        if _has_header(block):
+            block = _H1_LINE_RE.sub('', block)
+            block = _H2_LINE_RE.sub(r'▸ \1', block)
+            block = _H3_LINE_RE.sub(r'• \1', block)
+            paragraphs.extend(p.strip() for p in block.split('\n\n') if p.strip())
+        else:
+            paragraphs.append(block)
+    
     # Helper function to do the actual chunking
     def chunk_content(effective_max_length):
         chunks = []
         
-        clean_content = content
-        clean_content = re.sub(r'^#\s+.+$', '', clean_content, flags=re.MULTILINE)
-        clean_content = re.sub(r'^##\s+(.+)$', r'▸ \1', clean_content, flags=re.MULTILINE)
-        clean_content = re.sub(r'^###\s+(.+)$', r'• \1', clean_content, flags=re.MULTILINE)
+        def split_words(sentence):
+            # Sentence too long on its own: pack it word by word
+            return _pack_greedy(sentence.split(), effective_max_length, chunks, slice_word)
         
-        # Split into paragraphs
-        paragraphs = [p.strip() for p in clean_content.split('\n\n') if p.strip()]
-        paragraphs = [p for p in paragraphs if p]
+        def slice_word(word):
+            # Word is too long - split into fixed-size slices
+            chunks.extend(
+                word[i:i + effective_max_length]
+                for i in range(0, len(word), effective_max_length)
+            )
+            return [], 0
         
         # First chunk: Title + first paragraph
         if paragraphs:
@@ -139,90 +177,45 @@ def create_thread_chunks(content, title, max_length=300):
             remaining = []
         
         # Process remaining paragraphs
-        current_chunk = ""
+        # Pieces are collected in lists with a running length and only
+        # joined when a chunk is emitted
+        current_parts = []
+        current_len = 0
         for para in remaining:
-            test_chunk = f"{current_chunk}\n\n{para}" if current_chunk else para
+            para_len = len(para)
+            needed = current_len + 2 + para_len if current_parts else para_len
             
-            if len(test_chunk) <= effective_max_length:
-                current_chunk = test_chunk
+            if needed <= effective_max_length:
+                current_parts.append(para)
+                current_len = needed
             else:
-                if current_chunk:
-                    chunks.append(current_chunk)
+                if current_parts:
+                    chunks.append('\n\n'.join(current_parts))
                 
-                if len(para) > effective_max_length:
-                    sentences = re.split(r'(?<=[.!?])\s+', para)
-                    temp_chunk = ""
-                    
-                    for sentence in sentences:
-                        test_sentence = f"{temp_chunk} {sentence}".strip() if temp_chunk else sentence
-                        
-                        if len(test_sentence) <= effective_max_length:
-                            temp_chunk = test_sentence
-                        else:
-                            if temp_chunk:
-                                chunks.append(temp_chunk)
-                            
-                            if len(sentence) <= effective_max_length:
-                                temp_chunk = sentence
-                            else:
-                                # Split long sentence into word-based chunks
-                                words = sentence.split()
-                                word_chunk = ""
-                                
-                                for word in words:
-                                    if len(word) > effective_max_length:
-                                        # Word is too long - split into fixed-size slices
-                                        if word_chunk:
-                                            chunks.append(word_chunk)
-                                            word_chunk = ""
-                                        # Split word into slices of effective_max_length
-                                        for i in range(0, len(word), effective_max_length):
-                                            slice_part = word[i:i + effective_max_length]
-                                            chunks.append(slice_part)
-                                    else:
-                                        test_word_chunk = f"{word_chunk} {word}".strip() if word_chunk else word
-                                        
-                                        if len(test_word_chunk) <= effective_max_length:
-                                            word_chunk = test_word_chunk
-                                        else:
-                                            if word_chunk:
-                                                chunks.append(word_chunk)
-                                            word_chunk = word
-                                
-                                temp_chunk = word_chunk
-                    
-                    current_chunk = temp_chunk
+                if para_len > effective_max_length:
+                    temp_parts, temp_len = _pack_greedy(
+                        _SENTENCE_SPLIT_RE.split(para), effective_max_length, chunks, split_words
+                    )
+                    current_parts = [' '.join(temp_parts)] if temp_parts else []
+                    current_len = temp_len
                 else:
-                    current_chunk = para
+                    current_parts = [para]
+                    current_len = para_len
         
-        if current_chunk:
-            chunks.append(current_chunk)
+        if current_parts:
+            chunks.append('\n\n'.join(current_parts))
         
         return chunks
     
-    # Initial chunking with conservative estimate
-    # Assume max 2-digit numbering: "\n\n(99/99)" = 10 chars
-    initial_reserved = 10
-    chunks = chunk_content(max_length - initial_reserved)
+    # "\n\n(i/n)" takes 2 * digits(n) + 5 chars. A smaller budget can only
+    # produce more chunks, so the first digit count that holds is the answer
+    for digits in range(1, 4):
+        chunks = chunk_content(max_length - (2 * digits + 5))
+        if len(chunks) < 10 ** digits:
+            break
     
     total = len(chunks)
     if total > 1:
-        suffix_length = len(f"\n\n({total}/{total})")
-        
-        if suffix_length != initial_reserved:
-            chunks = chunk_content(max_length - suffix_length)
-            total = len(chunks)
-            
-            new_suffix_length = len(f"\n\n({total}/{total})")
-            
-            iteration_count = 0
-            while new_suffix_length != suffix_length and iteration_count < 5:
-                suffix_length = new_suffix_length
-                chunks = chunk_content(max_length - suffix_length)
-                total = len(chunks)
-                new_suffix_length = len(f"\n\n({total}/{total})")
-                iteration_count += 1
-        
         chunks = [f"{chunk}\n\n({i+1}/{total})" for i, chunk in enumerate(chunks)]
         
         chunks = [
@@ -232,15 +225,49 @@ def create_thread_chunks(content, title, max_length=300):
     
     return chunks
 
-def build_substack_email(title, html_content, image_path):
+def _pack_greedy(pieces, budget, chunks, split_long):
     """
-    Create beautiful HTML email:
-    - Proper DOCTYPE and meta tags
-    - Inline CSS for styling
-    - Embedded cover image (if provided)
-    - Responsive design
+    Greedily join pieces with ' ' into groups of at most budget chars
+    
+    Full groups are appended to chunks. A piece longer than budget is
+    handed to split_long(piece), which returns the (parts, length) group
+    to keep packing onto. Returns the last, still open (parts, length).
     """
-    template = """<!DOCTYPE html>
+    lens = list(map(len, pieces))
+    n = len(pieces)
+    parts = []
+    run = -1  # no separator before the first piece
+    i = 0
+    
+    while i < n:
+        if lens[i] > budget:
+            if parts:
+                chunks.append(' '.join(parts))
+            parts, length = split_long(pieces[i])
+            run = length if parts else -1
+            i += 1
+            continue
+        
+        # Sweep forward over the precomputed lengths
+        j = i
+        while j < n and run + 1 + lens[j] <= budget:
+            run += 1 + lens[j]
+            j += 1
+        
+        if j == i:
+            # Next piece doesn't fit after the open group: close it
+            chunks.append(' '.join(parts))
+            parts = []
+            run = -1
+            continue
+        
+        parts.extend(pieces[i:j])
+        i = j
+    
+    return parts, (run if parts else 0)
+
+# str.format template for build_substack_email, hence the doubled CSS braces
+_SUBSTACK_TEMPLATE = """<!DOCTYPE html>
     <html>
     <head>
         <meta charset="UTF-8">
@@ -264,10 +291,18 @@ def build_substack_email(title, html_content, image_path):
         {content}
     </body>
     </html>"""
-    
+
+def build_substack_email(title, html_content, image_path):
+    """
+    Create beautiful HTML email:
+    - Proper DOCTYPE and meta tags
+    - Inline CSS for styling
+    - Embedded cover image (if provided)
+    - Responsive design
+    """
     cover_image_html = '<img src="cid:cover_image">' if image_path else ''
     
-    return template.format(
+    return _SUBSTACK_TEMPLATE.format(
         title=title,
         cover_image=cover_image_html,
         content=html_content
@@ -0,0 +1,3 @@
+# Apps that show posts from the user's AT Protocol repo. A single thread
+# on the PDS appears in all of them, so they succeed or fail together
+AT_PROTOCOL_APPS = ('Bluesky', 'Flashes', 'Skylight', 'Pinksky')
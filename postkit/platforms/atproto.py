@@ -1,183 +1,353 @@
-from atproto import Client, models
+from atproto import AsyncClient, AsyncRequest, SessionEvent, models
+import asyncio
+import functools
+import itertools
+import json
+import os
 import time
+import weakref
+import httpx
+
+from . import AT_PROTOCOL_APPS
+from ..utils.cache import CACHE_DIR
+
+# Record model shortcuts, resolved once instead of per post / per facet
+_EmbedMain = models.AppBskyEmbedImages.Main
+_EmbedImage = models.AppBskyEmbedImages.Image
+_ReplyRef = models.AppBskyFeedPost.ReplyRef
+_FacetMain = models.AppBskyRichtextFacet.Main
+_FacetTag = models.AppBskyRichtextFacet.Tag
+_ByteSlice = models.AppBskyRichtextFacet.ByteSlice
+_strong_ref = models.create_strong_ref
+
+# Session strings per handle, so a later run can skip createSession
+_SESSION_FILE = CACHE_DIR / 'session.json'
+
+# Logged-in clients per event loop, then per handle. httpx connection
+# pools belong to the loop they were opened on, so they can't be shared
+# across loops
+_clients = weakref.WeakKeyDictionary()
+
+# httpx only speaks HTTP/2 when the optional h2 package is installed
+try:
+    import h2  # noqa: F401
+    _HTTP2 = True
+except ImportError:
+    _HTTP2 = False
+
+# Gap between thread posts when the PDS hasn't reported a rate-limit budget
+_DEFAULT_POST_GAP = 1.0
+# Longest single wait: past this, fail the publish rather than hang the CLI
+_MAX_WAIT = 60.0
+# 429 means the request was rejected, so it is always safe to resend. A 502
+# or 503 may come after the PDS already wrote the record, so those are only
+# retried for requests that can't create anything twice
+_RETRY_STATUSES = frozenset((429, 502, 503))
+_IDEMPOTENT_METHODS = frozenset(('GET', 'HEAD', 'OPTIONS'))
+
+class _RateLimitTransport(httpx.AsyncBaseTransport):
+    """
+    httpx transport that retries rate-limited / unavailable responses with
+    backoff and remembers the RateLimit-* budget the PDS last reported
+    """
+    def __init__(self, retries=3, backoff_factor=0.5, **transport_kwargs):
+        self._transport = httpx.AsyncHTTPTransport(**transport_kwargs)
+        self.retries = retries
+        self.backoff_factor = backoff_factor
+        self.remaining = None
+        self.reset = None
+    
+    async def handle_async_request(self, request):
+        for attempt in range(self.retries + 1):
+            response = await self._transport.handle_async_request(request)
+            self._record_budget(response.headers)
+            
+            status = response.status_code
+            if (attempt == self.retries or status not in _RETRY_STATUSES
+                    or (status != 429 and request.method not in _IDEMPOTENT_METHODS)):
+                return response
+            
+            delay = self._retry_delay(response.headers, attempt)
+            if delay > _MAX_WAIT:
+                # Not worth waiting for: hand the error response straight back
+                return response
+            
+            await response.aclose()
+            await asyncio.sleep(delay)
+    
+    async def aclose(self):
+        await self._transport.aclose()
+    
+    def _record_budget(self, headers):
+        remaining = headers.get('ratelimit-remaining')
+        reset = headers.get('ratelimit-reset')
+        if remaining is None or reset is None:
+            return
+        try:
+            self.remaining, self.reset = int(remaining), float(reset)
+        except ValueError:
+            pass
+    
+    def _retry_delay(self, headers, attempt):
+        retry_after = headers.get('retry-after', '')
+        if retry_after.isdigit():
+            delay = float(retry_after)
+        elif self.remaining == 0 and self.reset is not None:
+            delay = self.reset - time.time()
+        else:
+            delay = self.backoff_factor * 2 ** attempt
+        return max(delay, 0.0)
+    
+    def pacing_delay(self):
+        """Spread the remaining budget evenly over what's left of the window"""
+        if self.remaining is None or self.reset is None:
+            return _DEFAULT_POST_GAP
+        window = max(self.reset - time.time(), 0.0)
+        return min(window / max(self.remaining, 1), _MAX_WAIT)
+    
+    def check_budget(self, requests):
+        """
+        Fail before a multi-request operation starts when the budget
+        can't cover it and won't reset within _MAX_WAIT
+        """
+        if self.remaining is None or self.reset is None or self.remaining >= requests:
+            return
+        window = self.reset - time.time()
+        if window > _MAX_WAIT:
+            raise RuntimeError(
+                f"AT Protocol rate limit too low for {requests} posts "
+                f"({self.remaining} left, resets in {window:.0f}s)"
+            )
+
+class _PacedRequest(AsyncRequest):
+    """AsyncRequest that keeps a handle on its _RateLimitTransport"""
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.transport = kwargs['transport']
+
+def _new_client():
+    """AsyncClient whose requests share one keep-alive connection pool"""
+    transport = _RateLimitTransport(
+        http2=_HTTP2,
+        limits=httpx.Limits(max_keepalive_connections=20, max_connections=20)
+    )
+    return AsyncClient(request=_PacedRequest(transport=transport))
+
+def _load_sessions():
+    try:
+        with open(_SESSION_FILE) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def _save_session(handle, session_string):
+    """Persist the session for handle, readable only by the current user"""
+    sessions = _load_sessions()
+    sessions[handle] = session_string
+    try:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        tmp_file = _SESSION_FILE.with_suffix('.tmp')
+        fd = os.open(tmp_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, 'w') as f:
+            json.dump(sessions, f)
+        os.replace(tmp_file, _SESSION_FILE)
+    except OSError:
+        pass
 
 class ATProtoPublisher:
     def __init__(self, credentials):
         self.handle = credentials['handle']  # e.g., "username.bsky.social"
         self.password = credentials['password']  # App password
         self.client = None
+        self._blob_cache = {}  # image path -> uploaded blob ref
     
-    def authenticate(self):
+    async def authenticate(self):
         """Login once, works for all AT Protocol apps"""
-        self.client = Client()
-        self.client.login(self.handle, self.password)
+        if self.client is not None:
+            return
+        
+        clients = _clients.setdefault(asyncio.get_running_loop(), {})
+        client = clients.get(self.handle)
+        if client is None:
+            client = _new_client()
+            await self._login(client)
+            clients[self.handle] = client
+        self.client = client
     
-    def post_thread(self, chunks, image_path=None):
+    async def _login(self, client):
+        """Resume the saved session while its tokens are valid, else log in with the password"""
+        async def persist(event, session):
+            if event != SessionEvent.IMPORT:
+                _save_session(self.handle, session.export())
+        client.on_session_change(persist)
+        
+        session_string = _load_sessions().get(self.handle)
+        if session_string:
+            try:
+                # Refreshes the access token itself if only that has expired
+                await client.login(session_string=session_string)
+                return
+            except Exception:
+                pass
+        await client.login(self.handle, self.password)
+    
+    async def post_thread(self, chunks, image_path=None):
         """
         Post a thread:
         1. First post (with optional image)
         2. Replies to first post
         3. Each reply references root and parent
         """
-        posts = []
-        parent_ref = None
-        root_ref = None
-        
-        for i, chunk in enumerate(chunks):
-            if i == 0:
-                # First post
-                if image_path:
-                    # Upload image
-                    with open(image_path, 'rb') as f:
-                        img_data = f.read()
-                    blob = self.client.upload_blob(img_data)
-                    
-                    # Create post with image
-                    embed = models.AppBskyEmbedImages.Main(
-                        images=[models.AppBskyEmbedImages.Image(
-                            alt="",
-                            image=blob.blob
-                        )]
-                    )
-                    post = self.client.send_post(text=chunk, embed=embed)
-                else:
-                    post = self.client.send_post(text=chunk)
-                
-                # Set references
-                root_ref = models.create_strong_ref(post)
-                parent_ref = models.create_strong_ref(post)
-            else:
-                # Reply to previous post
-                reply_ref = models.AppBskyFeedPost.ReplyRef(
-                    parent=parent_ref,
-                    root=root_ref
-                )
-                post = self.client.send_post(text=chunk, reply_to=reply_ref)
-                parent_ref = models.create_strong_ref(post)
-            
-            posts.append(post)
-            
-            if i < len(chunks) - 1:
-                time.sleep(1)
-        
-        return self.post_thread_with_hashtags(chunks, image_path, hashtags=None)
+        return await self.post_thread_with_hashtags(chunks, image_path, hashtags=None)
     
-    def publish(self, content):
+    async def publish(self, content):
         """
         Publish to all AT Protocol apps
         Returns: {'Bluesky': True, 'Flashes': True, 'Skylight': True,'Pinksky': True}
         """
-        self.authenticate()
-        
-        results = {}
+        await self.authenticate()
         
         try:
             thread = content['thread'].copy()
             hashtags = content.get('hashtags', [])
             
             if hashtags and thread:
-                hashtag_text = ' '.join(hashtags)
                 first_chunk = thread[0]
+                # Size the tag line before building it: tags plus the
+                # spaces between them, plus the blank line separator
+                hashtag_len = sum(map(len, hashtags)) + len(hashtags) - 1
                 
-                if len(first_chunk) + len(hashtag_text) + 2 <= 300:
-                    thread[0] = f"{first_chunk}\n\n{hashtag_text}"
-            
-            self.post_thread_with_hashtags(thread, content['image'], hashtags)
+                if len(first_chunk) + hashtag_len + 2 <= 300:
+                    thread[0] = f"{first_chunk}\n\n{' '.join(hashtags)}"
             
-            results['Bluesky'] = True
-            results['Flashes'] = True
-            results['Skylight'] = True
-            results['Pinksky'] = True
+            # One thread on the PDS shows up in every app in AT_PROTOCOL_APPS,
+            # so there is nothing to fan out per app, and each reply needs its
+            # parent's ref - the posts themselves have to go out in order
+            blob = await self._upload_image(content['image']) if content['image'] else None
+            await self.post_thread_with_hashtags(thread, hashtags=hashtags, blob=blob)
+
+            results = dict.fromkeys(AT_PROTOCOL_APPS, True)
             
         except Exception as e:
             print(f"AT Protocol error: {e}")
-            results['Bluesky'] = False
-            results['Flashes'] = False
-            results['Skylight'] = False
-            results['Pinksky'] = False
+            results = dict.fromkeys(AT_PROTOCOL_APPS, False)
         
         return results
     
-    def post_thread_with_hashtags(self, chunks, image_path=None, hashtags=None):
+    async def post_thread_with_hashtags(self, chunks, image_path=None, hashtags=None, blob=None):
         """
         Post a thread with proper hashtag facets
+        Pass blob when the image at image_path was already uploaded
         """
-        posts = []
-        parent_ref = None
-        root_ref = None
+        if not chunks:
+            return []
         
-        for i, chunk in enumerate(chunks):
-            # Create facets for hashtags in this chunk
-            facets = []
-            if hashtags and i == 0:  # Only process hashtags in first post
-                facets = self.create_hashtag_facets(chunk, hashtags)
-            
-            if i == 0:
-                # First post
-                if image_path:
-                    # Upload image
-                    with open(image_path, 'rb') as f:
-                        img_data = f.read()
-                    blob = self.client.upload_blob(img_data)
-                    
-                    # Create post with image and facets
-                    embed = models.AppBskyEmbedImages.Main(
-                        images=[models.AppBskyEmbedImages.Image(
-                            alt="",
-                            image=blob.blob
-                        )]
-                    )
-                    post = self.client.send_post(text=chunk, embed=embed, facets=facets if facets else None)
-                else:
-                    post = self.client.send_post(text=chunk, facets=facets if facets else None)
-                
-                # Set references
-                root_ref = models.create_strong_ref(post)
-                parent_ref = models.create_strong_ref(post)
-            else:
-                # Reply to previous post
-                reply_ref = models.AppBskyFeedPost.ReplyRef(
-                    parent=parent_ref,
-                    root=root_ref
-                )
-                post = self.client.send_post(text=chunk, reply_to=reply_ref)
-                parent_ref = models.create_strong_ref(post)
-            
-            posts.append(post)
+        # Check the whole thread fits the budget up front: failing between
+        # replies would leave a partial thread that a rerun duplicates
+        transport = self.client.request.transport
+        transport.check_budget(len(chunks))
+        
+        if blob is None and image_path:
+            blob = await self._upload_image(image_path)
+        # Only the first post carries hashtags, so build its facets once up front
+        facets = None
+        if hashtags:
+            facets = self.create_hashtag_facets(chunks[0], hashtags)
+        
+        posts = [None] * len(chunks)
+        
+        # Bind the per-post lookups once for the loop
+        send_post = self.client.send_post
+        pacing_delay = transport.pacing_delay
+        loop = asyncio.get_running_loop()
+        
+        # First post (with image and facets)
+        embed = None
+        if blob is not None:
+            embed = _EmbedMain(
+                images=[_EmbedImage(
+                    alt="",
+                    image=blob
+                )]
+            )
+        # The gap before the next post runs while this one is in flight
+        next_slot = loop.time() + pacing_delay()
+        posts[0] = await send_post(text=chunks[0], embed=embed, facets=facets)
+        root_ref = parent_ref = _strong_ref(posts[0])
+        
+        # Replies: each references root and parent
+        for i, chunk in enumerate(chunks[1:], 1):
+            await asyncio.sleep(next_slot - loop.time())
+            next_slot = loop.time() + pacing_delay()
             
-            if i < len(chunks) - 1:
-                time.sleep(1)
+            reply_ref = _ReplyRef(
+                parent=parent_ref,
+                root=root_ref
+            )
+            posts[i] = await send_post(text=chunk, reply_to=reply_ref)
+            parent_ref = _strong_ref(posts[i])
         
         return posts
 
+    async def _upload_image(self, image_path):
+        """
+        Upload an image once per path; later threads reuse the blob ref
+        upload_blob needs the whole payload (the PDS wants a sized body),
+        so the file is read in one go rather than streamed
+        """
+        blob = self._blob_cache.get(image_path)
+        if blob is None:
+            with open(image_path, 'rb') as f:
+                blob = (await self.client.upload_blob(f.read())).blob
+            self._blob_cache[image_path] = blob
+        return blob
+
     def create_hashtag_facets(self, text, hashtags):
         """
         Create facets for hashtags to make them clickable
         
         Example: "#python #coding" becomes clickable tags
         """
-        facets = []
+        facets = _hashtag_facets(text, tuple(hashtags))
+        return list(facets) if facets else None
+
+@functools.lru_cache(maxsize=32)
+def _hashtag_facets(text, hashtags):
+    """Facets for (text, hashtags), shared by every thread that posts the same first chunk"""
+    facets = []
+    
+    # AT Protocol uses UTF-8 byte positions. For ASCII text they equal
+    # the str indexes; otherwise build a char -> byte offset table once
+    # instead of re-encoding the prefix for every tag
+    if text.isascii():
+        byte_offsets = None
+    else:
+        byte_offsets = list(itertools.accumulate(
+            (len(c.encode('utf-8')) for c in text), initial=0
+        ))
+    
+    for tag in hashtags:
+        # Remove # if present
+        clean_tag = tag.lstrip('#')
+        search_tag = f"#{clean_tag}"
         
-        for tag in hashtags:
-            # Remove # if present
-            clean_tag = tag.lstrip('#')
-            search_tag = f"#{clean_tag}"
+        # Find where this hashtag appears in the text
+        start_pos = text.find(search_tag)
+        if start_pos != -1:
+            end_pos = start_pos + len(search_tag)
+            if byte_offsets is None:
+                byte_start, byte_end = start_pos, end_pos
+            else:
+                byte_start, byte_end = byte_offsets[start_pos], byte_offsets[end_pos]
             
-            # Find where this hashtag appears in the text
-            start_pos = text.find(search_tag)
-            if start_pos != -1:
-                # Calculate byte positions (AT Protocol uses UTF-8 byte positions)
-                byte_start = len(text[:start_pos].encode('utf-8'))
-                byte_end = len(text[:start_pos + len(search_tag)].encode('utf-8'))
-                
-                # Create the facet
-                facet = models.AppBskyRichtextFacet.Main(
-                    features=[models.AppBskyRichtextFacet.Tag(tag=clean_tag)],
-                    index=models.AppBskyRichtextFacet.ByteSlice(
-                        byteStart=byte_start,
-                        byteEnd=byte_end
-                    )
+            # Create the facet
+            facet = _FacetMain(
+                features=[_FacetTag(tag=clean_tag)],
+                index=_ByteSlice(
+                    byteStart=byte_start,
+                    byteEnd=byte_end
                 )
-                facets.append(facet)
-        
-        return facets if facets else None
\ No newline at end of file
+            )
+            facets.append(facet)
+    
+    return tuple(facets)
@@ -1,7 +1,6 @@
 import smtplib
-from email.mime.multipart import MIMEMultipart
-from email.mime.text import MIMEText
-from email.mime.image import MIMEImage
+from email.message import EmailMessage
+from email.policy import SMTP
 
 class SubstackPublisher:
     def __init__(self, credentials):
@@ -10,6 +9,67 @@ class SubstackPublisher:
         self.smtp_port = credentials['smtp_port']   
         self.smtp_user = credentials['smtp_user']   
         self.smtp_password = credentials['smtp_password'] 
+        self._server = None
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.close()
+    
+    def _connect(self):
+        """
+        Open the SMTP session once (connect, STARTTLS, login)
+        and keep it for every message sent through this publisher
+        """
+        if self.smtp_port == 465:
+            # Use SSL
+            server = smtplib.SMTP_SSL(self.smtp_host, self.smtp_port)
+        else:
+            server = smtplib.SMTP(self.smtp_host, self.smtp_port)
+        
+        try:
+            server.ehlo()
+            if self.smtp_port != 465:
+                # Use TLS
+                server.starttls()
+                server.ehlo()
+            server.login(self.smtp_user, self.smtp_password)
+        except Exception:
+            server.close()
+            raise
+        
+        self._server = server
+        return server
+    
+    def close(self):
+        """QUIT the SMTP session if one is open"""
+        if self._server is None:
+            return
+        try:
+            self._server.quit()
+        except (smtplib.SMTPException, OSError):
+            self._server.close()
+        self._server = None
+    
+    def _send(self, msg):
+        server = self._server
+        if server is not None:
+            # Probe a reused session before sending rather than resending
+            # after a failure: the server may already have accepted the
+            # message when the connection drops, and a retry would post
+            # the newsletter twice
+            try:
+                alive = server.noop()[0] == 250
+            except (smtplib.SMTPException, OSError):
+                alive = False
+            if not alive:
+                server.close()
+                self._server = server = None
+        
+        if server is None:
+            server = self._connect()
+        server.send_message(msg)
     
     def publish(self, content):
         """
@@ -17,30 +77,15 @@ class SubstackPublisher:
         """
         try:
             # Create email
-            msg = MIMEMultipart('related')
+            msg = EmailMessage(policy=SMTP)
             msg['Subject'] = content['title']
             msg['From'] = self.smtp_user
             msg['To'] = self.publication_email
             
             # Add HTML content
-            html_part = MIMEText(content['html'], 'html')
-            msg.attach(html_part)
+            msg.set_content(content['html'], subtype='html')
             
-            # Handle different ports
-            if self.smtp_port == 465:
-                # Use SSL
-                with smtplib.SMTP_SSL(self.smtp_host, self.smtp_port) as server:
-                    server.ehlo()
-                    server.login(self.smtp_user, self.smtp_password)
-                    server.send_message(msg)
-            else:
-                # Use TLS
-                with smtplib.SMTP(self.smtp_host, self.smtp_port) as server:
-                    server.ehlo()
-                    server.starttls()
-                    server.ehlo()
-                    server.login(self.smtp_user, self.smtp_password)
-                    server.send_message(msg)
+            self._send(msg)
             
             return True
         except Exception as e:
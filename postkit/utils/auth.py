@@ -1,3 +1,5 @@
+import copy
+import functools
 import yaml
 from pathlib import Path
 import os
@@ -8,6 +10,28 @@ try:
 except ImportError:
     pass
 
+# libyaml-backed loader when PyYAML was built with it
+_YAML_LOADER = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
+# (section, key, env var, cast) - env vars override the config file
+_ENV_OVERRIDES = (
+    ('atproto', 'handle', 'ATPROTO_HANDLE', str),
+    ('atproto', 'password', 'ATPROTO_PASSWORD', str),
+    ('substack', 'smtp_user', 'SMTP_USER', str),
+    ('substack', 'smtp_password', 'SMTP_PASSWORD', str),
+    ('substack', 'email', 'SUBSTACK_EMAIL', str),
+    ('substack', 'smtp_host', 'SMTP_HOST', str),
+    ('substack', 'smtp_port', 'SMTP_PORT', int),
+)
+
+@functools.lru_cache(maxsize=8)
+def _read_config(config_path: Path, mtime_ns: int) -> dict:
+    """Parse the config file once per (path, mtime)"""
+    # Binary handle: the loader detects the encoding itself, so the bytes
+    # go straight to the parser without a Python-side decode
+    with open(config_path, 'rb') as f:
+        return yaml.load(f, Loader=_YAML_LOADER) or {}
+
 def load_credentials(config_path: Path) -> dict:
     """
     Load credentials from YAML config
@@ -16,28 +40,15 @@ def load_credentials(config_path: Path) -> dict:
     if not config_path.exists():
         raise FileNotFoundError(f"Config not found: {config_path}")
     
-    with open(config_path) as f:
-        config = yaml.safe_load(f) or {}
+    # Copy so the env overrides below never leak into the cached parse
+    config = copy.deepcopy(_read_config(config_path, config_path.stat().st_mtime_ns))
     
-    # Override with env vars - AT Protocol
-    if 'atproto' in config:
-        if os.getenv('ATPROTO_HANDLE'):
-            config['atproto']['handle'] = os.getenv('ATPROTO_HANDLE')
-        if os.getenv('ATPROTO_PASSWORD'):
-            config['atproto']['password'] = os.getenv('ATPROTO_PASSWORD')
-    
-    # Override with env vars - Substack
-    if 'substack' in config:
-        if os.getenv('SMTP_USER'):
-            config['substack']['smtp_user'] = os.getenv('SMTP_USER')
-        if os.getenv('SMTP_PASSWORD'):
-            config['substack']['smtp_password'] = os.getenv('SMTP_PASSWORD')
-
-        if os.getenv('SUBSTACK_EMAIL'):
-            config['substack']['email'] = os.getenv('SUBSTACK_EMAIL')
-        if os.getenv('SMTP_HOST'):
-            config['substack']['smtp_host'] = os.getenv('SMTP_HOST')
-        if os.getenv('SMTP_PORT'):
-            config['substack']['smtp_port'] = int(os.getenv('SMTP_PORT'))
+    environ = os.environ
+    for section, key, env_var, cast in _ENV_OVERRIDES:
+        if section not in config:
+            continue
+        value = environ.get(env_var)
+        if value:
+            config[section][key] = cast(value)
     
     return config
\ No newline at end of file
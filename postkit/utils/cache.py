@@ -0,0 +1,66 @@
+import hashlib
+import os
+import pickle
+from pathlib import Path
+from typing import Any, Callable
+
+try:
+    from platformdirs import user_cache_dir
+    CACHE_DIR = Path(user_cache_dir('postkit'))
+except ImportError:
+    CACHE_DIR = Path(os.getenv('XDG_CACHE_HOME', Path.home() / '.cache')) / 'postkit'
+
+# Bump when the cached structure changes so stale entries are ignored
+CACHE_VERSION = 2
+
+# Sources of the cached parse/normalize output: editing any of them
+# changes the fingerprint, so old entries are never served
+_CODE_DIR = Path(__file__).resolve().parent.parent / 'formats'
+_fingerprint = None
+
+def _code_fingerprint() -> str:
+    global _fingerprint
+    if _fingerprint is None:
+        stats = sorted((p.name, p.stat().st_mtime_ns, p.stat().st_size) for p in _CODE_DIR.glob('*.py'))
+        _fingerprint = hashlib.blake2b(repr(stats).encode(), digest_size=8).hexdigest()
+    return _fingerprint
+
+def get_or_compute(path: Path, compute_fn: Callable[[], Any], *extra_key: Any) -> Any:
+    """
+    Return compute_fn() for path, reusing a pickled result from disk
+    when the file has not changed since it was cached
+
+    Key: resolved path + mtime + size + code fingerprint (+ any extra_key values)
+    Each path keeps only its newest entry
+    """
+    stat = path.stat()
+    resolved = str(path.resolve())
+    key = f"{CACHE_VERSION}:{_code_fingerprint()}:{resolved}:{stat.st_mtime_ns}:{stat.st_size}:{extra_key!r}"
+    path_hash = hashlib.blake2b(resolved.encode(), digest_size=8).hexdigest()
+    key_hash = hashlib.blake2b(key.encode(), digest_size=16).hexdigest()
+    cache_file = CACHE_DIR / f"{path_hash}-{key_hash}.pkl"
+
+    try:
+        with open(cache_file, 'rb') as f:
+            return pickle.load(f)
+    except Exception:
+        pass
+
+    result = compute_fn()
+
+    # Cache is best-effort: never fail a publish because it can't be written
+    try:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        tmp_file = cache_file.with_suffix('.tmp')
+        with open(tmp_file, 'wb') as f:
+            pickle.dump(result, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_file, cache_file)
+        
+        # Drop entries left behind by earlier versions of this file
+        for old_file in CACHE_DIR.glob(f"{path_hash}-*.pkl"):
+            if old_file != cache_file:
+                old_file.unlink()
+    except Exception:
+        pass
+
+    return result
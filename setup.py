@@ -8,8 +8,9 @@ setup(
         "typer>=0.9.0",
         "rich>=13.0.0",
         "pyyaml>=6.0",
-        "atproto>=0.0.40",
-        "markdown>=3.4.0",
+        "atproto>=0.0.60",
+        "httpx>=0.23.0",
+        "mistune>=2.0.0",
     ],
     entry_points={
         "console_scripts": [
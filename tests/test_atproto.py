@@ -0,0 +1,213 @@
+import asyncio
+import time
+
+import httpx
+import pytest
+from atproto import Session, SessionEvent
+
+from postkit.platforms import atproto
+from postkit.platforms.atproto import ATProtoPublisher, _RateLimitTransport
+
+
+def _transport(responses, seen):
+    """_RateLimitTransport over a mock PDS answering with responses in order"""
+    def handler(request):
+        seen.append((request.method, request.content))
+        status, headers = responses.pop(0)
+        return httpx.Response(status, headers=headers, json={})
+
+    transport = _RateLimitTransport(backoff_factor=0)
+    transport._transport = httpx.MockTransport(handler)
+    return transport
+
+
+def _request(transport, method):
+    async def send():
+        async with httpx.AsyncClient(transport=transport) as client:
+            return await client.request(method, 'https://pds.test/xrpc/x', content=b'body')
+    return asyncio.run(send())
+
+
+def test_429_is_retried_with_the_same_body():
+    seen = []
+    transport = _transport([(429, {'retry-after': '0'}), (200, {})], seen)
+
+    assert _request(transport, 'POST').status_code == 200
+    assert seen == [('POST', b'body'), ('POST', b'body')]
+
+
+def test_503_is_retried_only_for_idempotent_requests():
+    seen = []
+    transport = _transport([(503, {}), (200, {})], seen)
+    assert _request(transport, 'GET').status_code == 200
+    assert len(seen) == 2
+
+    seen = []
+    transport = _transport([(503, {}), (200, {})], seen)
+    assert _request(transport, 'POST').status_code == 503
+    assert len(seen) == 1
+
+
+def test_retries_stop_after_the_limit():
+    seen = []
+    transport = _transport([(429, {'retry-after': '0'})] * 4, seen)
+
+    assert _request(transport, 'POST').status_code == 429
+    assert len(seen) == 4
+
+
+def test_long_rate_limit_wait_returns_the_error_immediately():
+    seen = []
+    reset = str(int(time.time()) + 3600)
+    transport = _transport([(429, {'ratelimit-remaining': '0', 'ratelimit-reset': reset})], seen)
+
+    started = time.monotonic()
+    assert _request(transport, 'POST').status_code == 429
+    assert time.monotonic() - started < 1
+    assert len(seen) == 1
+
+
+def test_pacing_spreads_the_remaining_budget(monkeypatch):
+    monkeypatch.setattr(atproto.time, 'time', lambda: 1000.0)
+    transport = _RateLimitTransport()
+    assert transport.pacing_delay() == atproto._DEFAULT_POST_GAP
+
+    transport._record_budget({'ratelimit-remaining': '100', 'ratelimit-reset': '1050'})
+    assert transport.pacing_delay() == pytest.approx(0.5)
+
+    transport._record_budget({'ratelimit-remaining': '0', 'ratelimit-reset': '5000'})
+    assert transport.pacing_delay() == atproto._MAX_WAIT
+
+
+def test_check_budget(monkeypatch):
+    monkeypatch.setattr(atproto.time, 'time', lambda: 1000.0)
+    transport = _RateLimitTransport()
+    transport.check_budget(5)  # no budget reported yet
+
+    transport._record_budget({'ratelimit-remaining': '1', 'ratelimit-reset': '4600'})
+    transport.check_budget(1)
+    with pytest.raises(RuntimeError):
+        transport.check_budget(2)
+
+    transport._record_budget({'ratelimit-remaining': '1', 'ratelimit-reset': '1030'})
+    transport.check_budget(2)  # resets soon enough to wait for
+
+
+class _FakeRequest:
+    def __init__(self, transport):
+        self.transport = transport
+
+
+class _FakeClient:
+    def __init__(self, transport):
+        self.request = _FakeRequest(transport)
+        self.sent = []
+
+    async def upload_blob(self, data):
+        raise AssertionError('nothing should be uploaded')
+
+    async def send_post(self, **kwargs):
+        self.sent.append(kwargs)
+        return atproto.models.ComAtprotoRepoCreateRecord.Response(
+            uri=f'at://did:plc:test/app.bsky.feed.post/{len(self.sent)}', cid='bafy'
+        )
+
+
+def test_thread_fails_before_posting_when_the_budget_is_short(monkeypatch):
+    monkeypatch.setattr(atproto.time, 'time', lambda: 1000.0)
+    transport = _RateLimitTransport()
+    transport._record_budget({'ratelimit-remaining': '1', 'ratelimit-reset': '4600'})
+
+    publisher = ATProtoPublisher({'handle': 'a', 'password': 'b'})
+    publisher.client = _FakeClient(transport)
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(publisher.post_thread_with_hashtags(['one', 'two'], 'missing.png'))
+    assert publisher.client.sent == []
+
+
+def test_thread_replies_reference_root_and_parent():
+    transport = _RateLimitTransport()
+    transport._record_budget({'ratelimit-remaining': '100', 'ratelimit-reset': '0'})
+
+    publisher = ATProtoPublisher({'handle': 'a', 'password': 'b'})
+    publisher.client = _FakeClient(transport)
+
+    posts = asyncio.run(publisher.post_thread(['one', 'two', 'three']))
+
+    assert [p.uri[-1] for p in posts] == ['1', '2', '3']
+    sent = publisher.client.sent
+    assert 'reply_to' not in sent[0]
+    assert sent[2]['reply_to'].root.uri == posts[0].uri
+    assert sent[2]['reply_to'].parent.uri == posts[1].uri
+
+
+def test_empty_thread_posts_nothing():
+    publisher = ATProtoPublisher({'handle': 'a', 'password': 'b'})
+    publisher.client = _FakeClient(_RateLimitTransport())
+
+    assert asyncio.run(publisher.post_thread_with_hashtags([], 'missing.png')) == []
+
+
+@pytest.fixture
+def session_file(tmp_path, monkeypatch):
+    monkeypatch.setattr(atproto, 'CACHE_DIR', tmp_path)
+    monkeypatch.setattr(atproto, '_SESSION_FILE', tmp_path / 'session.json')
+    monkeypatch.setattr(atproto, '_clients', atproto.weakref.WeakKeyDictionary())
+    return tmp_path / 'session.json'
+
+
+class _LoginClient:
+    def __init__(self, log):
+        self.log = log
+        self.callback = None
+
+    def on_session_change(self, callback):
+        self.callback = callback
+
+    async def login(self, login=None, password=None, session_string=None):
+        self.log.append(session_string or (login, password))
+        if session_string == 'expired':
+            raise RuntimeError('refresh token expired')
+        if password:
+            session = Session('a', 'did:plc:test', 'access', 'refresh')
+            await self.callback(SessionEvent.CREATE, session)
+
+
+def _authenticate(log, monkeypatch):
+    monkeypatch.setattr(atproto, '_new_client', lambda: _LoginClient(log))
+    asyncio.run(ATProtoPublisher({'handle': 'a', 'password': 'pw'}).authenticate())
+
+
+def test_session_is_saved_privately_and_reused(session_file, monkeypatch):
+    log = []
+    _authenticate(log, monkeypatch)
+    saved = atproto._load_sessions()['a']
+
+    assert log == [('a', 'pw')]
+    assert session_file.stat().st_mode & 0o777 == 0o600
+
+    _authenticate(log, monkeypatch)
+    assert log == [('a', 'pw'), saved]
+
+
+def test_unusable_session_falls_back_to_password(session_file, monkeypatch):
+    atproto._save_session('a', 'expired')
+    log = []
+    _authenticate(log, monkeypatch)
+
+    assert log == ['expired', ('a', 'pw')]
+    assert atproto._load_sessions()['a'] != 'expired'
+
+
+def test_sessions_are_kept_per_handle(session_file):
+    atproto._save_session('a', 'one')
+    atproto._save_session('b', 'two')
+
+    assert atproto._load_sessions() == {'a': 'one', 'b': 'two'}
+
+
+def test_missing_or_corrupt_session_file_is_ignored(session_file):
+    assert atproto._load_sessions() == {}
+    session_file.write_text('{not json')
+    assert atproto._load_sessions() == {}
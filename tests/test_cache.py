@@ -0,0 +1,74 @@
+import os
+
+import pytest
+
+from postkit.utils import cache
+
+
+@pytest.fixture
+def cache_dir(tmp_path, monkeypatch):
+    directory = tmp_path / 'cache'
+    monkeypatch.setattr(cache, 'CACHE_DIR', directory)
+    return directory
+
+
+@pytest.fixture
+def post(tmp_path):
+    path = tmp_path / 'post.md'
+    path.write_text('first')
+    return path
+
+
+def _touch(path, text):
+    """Rewrite path with a new mtime so the cache key changes"""
+    stat = path.stat()
+    path.write_text(text)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+def test_result_is_reused_until_the_file_changes(cache_dir, post):
+    assert cache.get_or_compute(post, lambda: 1) == 1
+    assert cache.get_or_compute(post, lambda: 2) == 1
+
+    _touch(post, 'second')
+    assert cache.get_or_compute(post, lambda: 3) == 3
+
+
+def test_extra_key_values_are_part_of_the_key(cache_dir, post):
+    assert cache.get_or_compute(post, lambda: 'mistune', 'mistune 3.0') == 'mistune'
+    assert cache.get_or_compute(post, lambda: 'basic', 'basic') == 'basic'
+
+
+def test_code_changes_invalidate_entries(cache_dir, post, monkeypatch):
+    assert cache.get_or_compute(post, lambda: 'old') == 'old'
+
+    monkeypatch.setattr(cache, '_fingerprint', 'edited-formats-code')
+    assert cache.get_or_compute(post, lambda: 'new') == 'new'
+
+
+def test_only_the_newest_entry_per_file_is_kept(cache_dir, post, tmp_path):
+    other = tmp_path / 'other.md'
+    other.write_text('other')
+    cache.get_or_compute(other, lambda: 'other')
+
+    for i in range(3):
+        _touch(post, f'edit {i}')
+        cache.get_or_compute(post, lambda: i)
+
+    assert len(list(cache_dir.glob('*.pkl'))) == 2
+
+
+def test_corrupt_entry_is_recomputed(cache_dir, post):
+    cache.get_or_compute(post, lambda: 1)
+    for entry in cache_dir.glob('*.pkl'):
+        entry.write_bytes(b'not a pickle')
+
+    assert cache.get_or_compute(post, lambda: 2) == 2
+
+
+def test_unwritable_cache_dir_still_computes(tmp_path, post, monkeypatch):
+    blocker = tmp_path / 'blocker'
+    blocker.write_text('a file where the cache dir should be')
+    monkeypatch.setattr(cache, 'CACHE_DIR', blocker / 'cache')
+
+    assert cache.get_or_compute(post, lambda: 'fresh') == 'fresh'
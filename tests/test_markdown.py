@@ -0,0 +1,85 @@
+import random
+
+import pytest
+import yaml
+
+from postkit.formats import markdown
+from postkit.formats.markdown import _parse_simple_frontmatter, parse_markdown_post, renderer_id
+
+
+def test_simple_frontmatter_fast_path():
+    text = "title: My Post\ntags: tech, python, tutorial\nshort: A short summary."
+    assert _parse_simple_frontmatter(text) == {
+        'title': 'My Post',
+        'tags': 'tech, python, tutorial',
+        'short': 'A short summary.',
+    }
+
+
+@pytest.mark.parametrize('text', [
+    "title: a\tb",          # safe_load raises ScannerError
+    "title: a\t",
+    "true: x",              # YAML key is the bool True
+    "Null: x",              # YAML key is None
+    "off: x",
+    "title: yes",           # YAML value is a bool
+    "title: 1.5",
+    "title: 2024-01-02",
+    "title: a: b",
+    "title: a #comment",
+    "tags: [a, b]",
+    "title: 'quoted'",
+    "title: a\x85b",        # YAML line break
+    "title: a\x07",         # not allowed in a YAML stream
+    "title: a\nnested:\n  key: b",
+    "title: a\ntitle: b",
+])
+def test_simple_frontmatter_falls_back_to_yaml(text):
+    assert _parse_simple_frontmatter(text) is None
+
+
+def test_simple_frontmatter_matches_safe_load():
+    """Whenever the fast path answers, it agrees with yaml.safe_load"""
+    rng = random.Random(0)
+    alphabet = list("abcXY _-:#'\"\t.,!?@%&*[]{}|>~=019\\`") + [
+        'true', 'null', 'yes', 'no', 'on', '1.5', '0x1f', '2024-01-02', ': ', ' #',
+        'é', '😀', '\x85', '\u2028', '\ufeff', '\xa0', '\x00', '\x07', '\r',
+    ]
+    keys = ['title', 'tags', 'a-b', '_k', 'x1', 'y', 'true', 'Null', 'yes', 'off', 'NO', '1a', '~']
+    separators = [' ', '  ', '\t', '']
+
+    for _ in range(20000):
+        lines = []
+        for _ in range(rng.randint(1, 3)):
+            value = ''.join(rng.choice(alphabet) for _ in range(rng.randint(0, 6)))
+            lines.append(rng.choice(keys) + ':' + rng.choice(separators) + value)
+        text = '\n'.join(lines)
+
+        fast = _parse_simple_frontmatter(text)
+        if fast is not None:
+            assert fast == yaml.safe_load(text), text
+
+
+def test_parse_markdown_post(tmp_path):
+    post = tmp_path / 'post.md'
+    post.write_bytes(b"---\r\ntitle: Hello\r\ntags: a, b\r\n---\r\n\r\nFirst para.\r\n\r\nSecond para.\r\n")
+
+    data = parse_markdown_post(post)
+
+    assert data['title'] == 'Hello'
+    assert data['tags'] == ['a', 'b']
+    assert data['blocks'] == ['First para.', 'Second para.']
+
+
+def test_parse_markdown_post_title_from_h1(tmp_path):
+    post = tmp_path / 'post.md'
+    post.write_text("# Heading Title\n\nBody text.\n")
+
+    assert parse_markdown_post(post)['title'] == 'Heading Title'
+
+
+def test_renderer_id_follows_renderer_preference(monkeypatch):
+    assert renderer_id().split()[0] in ('mistune', 'markdown', 'basic')
+
+    monkeypatch.setattr(markdown, '_RENDERER_PACKAGES', (('postkit_no_such_renderer', 'nope'),))
+    assert renderer_id() == 'basic'
@@ -0,0 +1,102 @@
+import random
+import re
+
+from postkit.formats.normalizer import _pack_greedy, create_thread_chunks
+
+_NUMBERING_RE = re.compile(r'\n\n\((\d+)/(\d+)\)\Z')
+
+
+def _reference_pack(pieces, budget, chunks, split_long):
+    """One piece at a time: the packing _pack_greedy has to reproduce"""
+    parts, length = [], 0
+    for piece in pieces:
+        if len(piece) > budget:
+            if parts:
+                chunks.append(' '.join(parts))
+            parts, length = split_long(piece)
+        elif not parts:
+            parts, length = [piece], len(piece)
+        elif length + 1 + len(piece) <= budget:
+            parts.append(piece)
+            length += 1 + len(piece)
+        else:
+            chunks.append(' '.join(parts))
+            parts, length = [piece], len(piece)
+    return parts, length
+
+
+def _slicer(budget, chunks):
+    """split_long that emits full slices and keeps the tail open"""
+    def split_long(piece):
+        cut = len(piece) - len(piece) % budget or len(piece) - budget
+        chunks.extend(piece[i:i + budget] for i in range(0, cut, budget))
+        tail = piece[cut:]
+        return [tail], len(tail)
+    return split_long
+
+
+def test_pack_greedy_matches_reference():
+    rng = random.Random(0)
+    for _ in range(2000):
+        budget = rng.randint(1, 40)
+        pieces = [
+            'x' * rng.choice([0, 1, 2, 5, 10, 20, 45, 90])
+            for _ in range(rng.randint(0, 30))
+        ]
+
+        expected_chunks = []
+        expected = _reference_pack(pieces, budget, expected_chunks, _slicer(budget, expected_chunks))
+        actual_chunks = []
+        actual = _pack_greedy(pieces, budget, actual_chunks, _slicer(budget, actual_chunks))
+
+        assert actual_chunks == expected_chunks
+        assert actual == expected
+
+
+def test_pack_greedy_emits_full_groups():
+    chunks = []
+    parts, length = _pack_greedy(['aaa', 'bb', 'cccc', 'd'], 7, chunks, None)
+
+    assert chunks == ['aaa bb']
+    assert (parts, length) == (['cccc', 'd'], 6)
+
+
+def test_short_post_is_a_single_unnumbered_chunk():
+    assert create_thread_chunks(['Just one paragraph.'], 'Title') == ['Title\n\nJust one paragraph.']
+
+
+def _words_paragraphs(rng, count):
+    return [
+        ' '.join(
+            rng.choice(['alpha', 'beta', 'gamma', 'delta', 'a', 'longerword']) + rng.choice(['', '.', '!'])
+            for _ in range(rng.randint(1, 80))
+        )
+        for _ in range(count)
+    ]
+
+
+def test_thread_chunks_fit_and_keep_every_word():
+    rng = random.Random(1)
+    for paragraph_count in (2, 5, 20, 60):
+        blocks = _words_paragraphs(rng, paragraph_count)
+        chunks = create_thread_chunks(blocks, 'A Title', max_length=300)
+
+        assert all(len(chunk) <= 300 for chunk in chunks)
+
+        total = len(chunks)
+        bodies = []
+        for i, chunk in enumerate(chunks, 1):
+            match = _NUMBERING_RE.search(chunk)
+            assert match and (int(match.group(1)), int(match.group(2))) == (i, total)
+            bodies.append(chunk[:match.start()])
+
+        assert ' '.join(bodies).split() == ' '.join(['A Title'] + blocks).split()
+
+
+def test_thread_chunks_reserve_room_for_two_digit_numbering():
+    blocks = _words_paragraphs(random.Random(2), 80)
+    chunks = create_thread_chunks(blocks, 'T', max_length=300)
+
+    assert len(chunks) >= 10
+    assert all(len(chunk) <= 300 for chunk in chunks)
+    assert chunks[-1].endswith(f'({len(chunks)}/{len(chunks)})')